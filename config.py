@@ -4,6 +4,9 @@
 DEFAULT_TIMEOUT = 10  # Timeout for HTTP requests
 DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0"}
 RATE_LIMIT = 2  # Delay in seconds between requests to avoid overloading servers
+MAX_RETRIES = 3  # Attempts per page before giving up on transient failures
+RETRY_BACKOFF_BASE = 1  # Base delay in seconds for exponential backoff (plus up to this much jitter)
+RETRY_MAX_DELAY = 60  # Upper bound in seconds for a single backoff sleep
 
 # Default CSS Selectors (Used if AI model isn't available)
 DEFAULT_CSS_SELECTORS = {
@@ -1,10 +1,11 @@
 import asyncio
-import json
 import logging
 import time
 import os
 from typing import List, Dict, Any, Optional
 
+import orjson
+
 # Import for Pydantic v2
 from pydantic import BaseModel, Field
 
@@ -12,6 +13,8 @@ from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from crawl4ai.extraction_strategy import LLMExtractionStrategy, JsonCssExtractionStrategy
 from crawl4ai.content_filter_strategy import PruningContentFilter
 import config
+from utils.retry_utils import arun_with_retry
+from utils.dns_utils import prewarm_dns
 
 # Set up logging
 logging.basicConfig(
@@ -30,16 +33,25 @@ class UniversityData(BaseModel):
 def load_university_urls(filename=config.INPUT_FILE):
     """Loads university URLs dynamically from JSON."""
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filename, "rb") as f:
+            return orjson.loads(f.read())
     except Exception as e:
         logging.error(f"Failed to load universities JSON file: {e}")
         return []
 
-async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str]) -> Dict[str, Any]:
+# Markdown fallback rules: (field, keywords, max lines kept, minimum stripped line length)
+MARKDOWN_FALLBACK_RULES = [
+    ("courses", ('degree', 'course', 'program', 'major', 'bachelor', 'master', 'phd'), 5, 0),
+    ("admissions_requirements", ('requirement', 'admission', 'prerequisite', 'qualify', 'eligibility', 'gpa', 'test score'), 5, 0),
+    ("application_deadlines", ('deadline', 'date', 'application period', 'apply by', 'due by', 'submit by'), 5, 0),
+]
+
+async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str], scraped_at: Optional[str] = None) -> Dict[str, Any]:
     """Extract data from a university website using Crawl4AI."""
     url = uni["url"]
     name = uni["name"]
+    if scraped_at is None:
+        scraped_at = time.strftime("%Y-%m-%d %H:%M:%S")
     
     logging.info(f"Processing {name} at {url}")
     
@@ -74,7 +86,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
     try:
         # Try CSS extraction first (more reliable in CI environments)
         logging.info(f"Attempting CSS-based extraction for {name}")
-        result = await crawler.arun(url=url, config=run_config_css)
+        result = await arun_with_retry(crawler, url, run_config_css)
         
         # Check if extraction succeeded with CSS
         if result.extracted_content and isinstance(result.extracted_content, dict):
@@ -114,7 +126,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
                         follow_redirects=True
                     )
                     
-                    result = await crawler.arun(url=url, config=run_config_llm)
+                    result = await arun_with_retry(crawler, url, run_config_llm)
                     extracted = result.extracted_content if result.extracted_content else {}
                     logging.info(f"LLM extraction completed for {name}")
                 except Exception as e:
@@ -124,38 +136,51 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
                 logging.warning(f"CSS extraction failed for {name} and LLM extraction skipped in CI environment")
                 extracted = {}
         
+        # Track the fallback condition while building the record instead of re-reading it
+        courses = extracted.get("courses") or ["Not found"]
+        requirements = extracted.get("admissions_requirements") or ["Not found"]
+        deadlines = extracted.get("application_deadlines") or ["Not found"]
+        needs_fallback = (
+            courses == ["Not found"]
+            and requirements == ["Not found"]
+            and deadlines == ["Not found"]
+        )
+
         # Format the data with cleaner structure
         data = {
             "name": name,
             "url": url,
-            "courses": extracted.get("courses", ["Not found"]),
-            "admissions_requirements": extracted.get("admissions_requirements", ["Not found"]),
-            "application_deadlines": extracted.get("application_deadlines", ["Not found"]),
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")
+            "courses": courses,
+            "admissions_requirements": requirements,
+            "application_deadlines": deadlines,
+            "scraped_at": scraped_at
         }
-        
+
         # If we got some markdown content but no structured data, we could use that as fallback
-        if all(data[key] == ["Not found"] for key in ["courses", "admissions_requirements", "application_deadlines"]):
+        if needs_fallback and result.markdown:
             logging.warning(f"No structured data found for {name}, using markdown fallback")
-            if result.markdown:
-                # Very simple keyword-based extraction from markdown as last resort
-                markdown_lines = result.markdown.split('\n')
-                
-                # Simple keyword matching
-                course_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                                ['degree', 'course', 'program', 'major', 'bachelor', 'master', 'phd'])]
-                if course_lines:
-                    data["courses"] = course_lines[:5]  # Limit to first 5 matches
-                
-                req_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                             ['requirement', 'admission', 'prerequisite', 'qualify', 'eligibility', 'gpa', 'test score'])]
-                if req_lines:
-                    data["admissions_requirements"] = req_lines[:5]
-                
-                deadline_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                                  ['deadline', 'date', 'application period', 'apply by', 'due by', 'submit by'])]
-                if deadline_lines:
-                    data["application_deadlines"] = deadline_lines[:5]
+            # Very simple keyword-based extraction from markdown as last resort
+            markdown_lines = result.markdown.splitlines()
+            
+            # Simple keyword matching; one sweep over the lines fills every category
+            # and stops once all are full.
+            matches = {key: [] for key, _, _, _ in MARKDOWN_FALLBACK_RULES}
+            pending = len(MARKDOWN_FALLBACK_RULES)
+            for line in markdown_lines:
+                line_lower = line.lower()
+                stripped = line.strip()
+                for key, keywords, limit, min_length in MARKDOWN_FALLBACK_RULES:
+                    found = matches[key]
+                    if len(found) < limit and len(stripped) > min_length and any(kw in line_lower for kw in keywords):
+                        found.append(stripped)
+                        if len(found) == limit:
+                            pending -= 1
+                if not pending:
+                    break
+            
+            for key, found in matches.items():
+                if found:
+                    data[key] = found
         
         logging.info(f"Successfully extracted data for {name}")
         return data
@@ -167,7 +192,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
             "courses": ["Not found"],
             "admissions_requirements": ["Not found"],
             "application_deadlines": ["Not found"],
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "scraped_at": scraped_at,
             "error": str(e)
         }
 
@@ -187,6 +212,9 @@ async def process_universities(universities: List[Dict[str, str]]) -> List[Dict[
     # Adjust max_concurrent_tasks based on your system's capabilities
     max_tasks = min(3, len(universities))  # Conservative setting for CI environment
     
+    # Warm the resolver cache before the browser starts issuing requests
+    await prewarm_dns(universities)
+    
     # Initialize the AsyncWebCrawler with the browser configuration
     async with AsyncWebCrawler(
         config=browser_config,
@@ -198,8 +226,9 @@ async def process_universities(universities: List[Dict[str, str]]) -> List[Dict[
             batch = universities[i:i+max_tasks]
             logging.info(f"Processing batch {i//max_tasks + 1} with {len(batch)} universities")
             
-            # Create tasks for the batch
-            tasks = [extract_university_data(crawler, uni) for uni in batch]
+            # Create tasks for the batch; the batch runs concurrently, so it shares one timestamp
+            scraped_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            tasks = [extract_university_data(crawler, uni, scraped_at) for uni in batch]
             
             # Run tasks concurrently
             batch_results = await asyncio.gather(*tasks)
@@ -244,8 +273,9 @@ async def main():
     
     # Save results
     try:
-        with open(config.OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        # orjson serializes straight to bytes; write them through a single buffered call
+        with open(config.OUTPUT_FILE, "wb", buffering=1024 * 1024) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         logging.info(f"Saved structured data to {config.OUTPUT_FILE}")
         
         # Print a summary
@@ -7,12 +7,12 @@ This script is optimized for running in CI environments.
 # Setup critical error handling for imports
 try:
     import asyncio
-    import json
     import logging
     import time
     import os
     import sys
     from typing import List, Dict, Any, Optional
+    import orjson
     from pydantic import BaseModel, Field
 except ImportError as e:
     # Write directly to stderr for critical import failures
@@ -29,6 +29,8 @@ try:
     from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
     from crawl4ai.content_filter_strategy import PruningContentFilter
     import config
+    from utils.retry_utils import arun_with_retry
+    from utils.dns_utils import prewarm_dns
 except ImportError as e:
     # Write directly to stderr for critical import failures
     sys.stderr.write(f"CRITICAL MODULE IMPORT ERROR: {e}\n")
@@ -163,16 +165,28 @@ class CustomJsonCssExtractionStrategy(JsonCssExtractionStrategy):
 def load_university_urls(filename=config.INPUT_FILE):
     """Loads university URLs dynamically from JSON."""
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filename, "rb") as f:
+            return orjson.loads(f.read())
     except Exception as e:
         logging.error(f"Failed to load universities JSON file: {e}")
         return []
 
-async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str]) -> Dict[str, Any]:
+# Markdown fallback rules: (field, keywords, max lines kept, minimum stripped line length)
+MARKDOWN_FALLBACK_RULES = [
+    ("courses", ('degree', 'course', 'program', 'major', 'bachelor', 'master', 'phd', 'concentration', 'field of study'), 10, 0),
+    ("course_descriptions", ('program', 'study', 'academic', 'field', 'course', 'concentration'), 10, 80),
+    ("admissions_requirements", ('requirement', 'admission', 'prerequisite', 'qualify', 'eligibility', 'gpa', 'test score', 'application process'), 10, 0),
+    ("application_deadlines", ('deadline', 'date', 'application period', 'apply by', 'due by', 'submit by', 'timeline'), 10, 0),
+    ("early_admission", ('early action', 'early decision', 'early admission', 'november', 'december'), 5, 0),
+    ("regular_admission", ('regular decision', 'regular admission', 'january', 'february', 'march', 'april'), 5, 0),
+]
+
+async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str], scraped_at: Optional[str] = None) -> Dict[str, Any]:
     """Extract data from a university website using Crawl4AI."""
     url = uni["url"]
     name = uni["name"]
+    if scraped_at is None:
+        scraped_at = time.strftime("%Y-%m-%d %H:%M:%S")
     
     logging.info(f"Processing {name} at {url}")
     
@@ -270,7 +284,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
     try:
         # Use CSS extraction (more reliable in CI environments)
         logging.info(f"Attempting CSS-based extraction for {name}")
-        result = await crawler.arun(url=url, config=run_config_css)
+        result = await arun_with_retry(crawler, url, run_config_css)
         
         # Check if extraction succeeded with CSS
         extracted = {}
@@ -285,7 +299,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
         for additional_url in additional_pages:
             try:
                 logging.info(f"Extracting additional data from {additional_url}")
-                add_result = await crawler.arun(url=additional_url, config=run_config_css)
+                add_result = await arun_with_retry(crawler, additional_url, run_config_css)
                 
                 if add_result.extracted_content and isinstance(add_result.extracted_content, dict):
                     # For each field, combine with existing data
@@ -311,21 +325,31 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
             except Exception as e:
                 logging.warning(f"Error extracting additional data from {additional_url}: {e}")
         
+        # Track the fallback condition while building the record instead of re-reading it
+        courses = extracted.get("courses") or ["Not found"]
+        requirements = extracted.get("admissions_requirements") or ["Not found"]
+        deadlines = extracted.get("application_deadlines") or ["Not found"]
+        needs_fallback = (
+            courses == ["Not found"]
+            and requirements == ["Not found"]
+            and deadlines == ["Not found"]
+        )
+
         # Format the data with cleaner structure
         data = {
             "name": name,
             "url": url,
-            "courses": extracted.get("courses", ["Not found"]),
-            "course_descriptions": extracted.get("course_descriptions", ["Not found"]),
-            "admissions_requirements": extracted.get("admissions_requirements", ["Not found"]),
-            "application_deadlines": extracted.get("application_deadlines", ["Not found"]),
-            "early_admission": extracted.get("early_admission", ["Not found"]),
-            "regular_admission": extracted.get("regular_admission", ["Not found"]),
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")
+            "courses": courses,
+            "course_descriptions": extracted.get("course_descriptions") or ["Not found"],
+            "admissions_requirements": requirements,
+            "application_deadlines": deadlines,
+            "early_admission": extracted.get("early_admission") or ["Not found"],
+            "regular_admission": extracted.get("regular_admission") or ["Not found"],
+            "scraped_at": scraped_at
         }
-        
+
         # If we got some markdown content but no structured data, we could use that as fallback
-        if all(data[key][0] == "Not found" for key in ["courses", "admissions_requirements", "application_deadlines"]):
+        if needs_fallback:
             logging.warning(f"No structured data found for {name}, using markdown fallback")
             if hasattr(result, 'markdown') and result.markdown:
                 # Check if markdown is a string or an object with appropriate attributes
@@ -335,39 +359,25 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
                 elif hasattr(result.markdown, 'fit_markdown') and result.markdown.fit_markdown:
                     markdown_text = result.markdown.fit_markdown
                 
-                # Simple keyword-based extraction from markdown as last resort
-                markdown_lines = markdown_text.split('\n')
-                
-                # Simple keyword matching
-                course_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                                ['degree', 'course', 'program', 'major', 'bachelor', 'master', 'phd', 'concentration', 'field of study'])]
-                if course_lines:
-                    data["courses"] = course_lines[:10]  # Increased to capture more courses
+                # Simple keyword-based extraction from markdown as last resort.
+                # One sweep over the lines fills every category and stops once all are full.
+                matches = {key: [] for key, _, _, _ in MARKDOWN_FALLBACK_RULES}
+                pending = len(MARKDOWN_FALLBACK_RULES)
+                for line in markdown_text.splitlines():
+                    line_lower = line.lower()
+                    stripped = line.strip()
+                    for key, keywords, limit, min_length in MARKDOWN_FALLBACK_RULES:
+                        found = matches[key]
+                        if len(found) < limit and len(stripped) > min_length and any(kw in line_lower for kw in keywords):
+                            found.append(stripped)
+                            if len(found) == limit:
+                                pending -= 1
+                    if not pending:
+                        break
                 
-                description_lines = [line.strip() for line in markdown_lines if len(line.strip()) > 80 and any(kw in line.lower() for kw in 
-                                     ['program', 'study', 'academic', 'field', 'course', 'concentration'])]
-                if description_lines:
-                    data["course_descriptions"] = description_lines[:10]
-                
-                req_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                             ['requirement', 'admission', 'prerequisite', 'qualify', 'eligibility', 'gpa', 'test score', 'application process'])]
-                if req_lines:
-                    data["admissions_requirements"] = req_lines[:10]  # Increased to capture more requirements
-                
-                deadline_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                                 ['deadline', 'date', 'application period', 'apply by', 'due by', 'submit by', 'timeline'])]
-                if deadline_lines:
-                    data["application_deadlines"] = deadline_lines[:10]
-                
-                early_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                              ['early action', 'early decision', 'early admission', 'november', 'december'])]
-                if early_lines:
-                    data["early_admission"] = early_lines[:5]
-                
-                regular_lines = [line.strip() for line in markdown_lines if any(kw in line.lower() for kw in 
-                                ['regular decision', 'regular admission', 'january', 'february', 'march', 'april'])]
-                if regular_lines:
-                    data["regular_admission"] = regular_lines[:5]
+                for key, found in matches.items():
+                    if found:
+                        data[key] = found
         
         logging.info(f"Successfully extracted data for {name}")
         return data
@@ -382,7 +392,7 @@ async def extract_university_data(crawler: AsyncWebCrawler, uni: Dict[str, str])
             "application_deadlines": ["Not found"],
             "early_admission": ["Not found"],
             "regular_admission": ["Not found"],
-            "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "scraped_at": scraped_at,
             "error": str(e)
         }
 
@@ -402,6 +412,9 @@ async def process_universities(universities: List[Dict[str, str]]) -> List[Dict[
     # Adjust max_concurrent_tasks based on your system's capabilities
     max_tasks = min(1, len(universities))  # Ultra conservative for CI environment, just one at a time
     
+    # Warm the resolver cache before the browser starts issuing requests
+    await prewarm_dns(universities)
+    
     # Initialize the AsyncWebCrawler with the browser configuration
     async with AsyncWebCrawler(
         config=browser_config,
@@ -412,8 +425,9 @@ async def process_universities(universities: List[Dict[str, str]]) -> List[Dict[
             batch = universities[i:i+max_tasks]
             logging.info(f"Processing batch {i//max_tasks + 1} with {len(batch)} universities")
             
-            # Create tasks for the batch
-            tasks = [extract_university_data(crawler, uni) for uni in batch]
+            # Create tasks for the batch; the batch runs concurrently, so it shares one timestamp
+            scraped_at = time.strftime("%Y-%m-%d %H:%M:%S")
+            tasks = [extract_university_data(crawler, uni, scraped_at) for uni in batch]
             
             # Run tasks concurrently
             batch_results = await asyncio.gather(*tasks)
@@ -491,14 +505,15 @@ async def main():
     
     # Save results
     try:
-        with open(config.OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        # orjson serializes straight to bytes; write them through a single buffered call
+        with open(config.OUTPUT_FILE, "wb", buffering=1024 * 1024) as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         logging.info(f"Saved structured data to {config.OUTPUT_FILE}")
         
         # Verify the data was saved correctly
         try:
-            with open(config.OUTPUT_FILE, "r", encoding="utf-8") as f:
-                test_data = json.load(f)
+            with open(config.OUTPUT_FILE, "rb") as f:
+                test_data = orjson.loads(f.read())
                 logging.info(f"Successfully verified JSON data (contains {len(test_data)} universities)")
         except Exception as e:
             logging.error(f"Error verifying saved data: {e}")
@@ -514,8 +529,8 @@ async def main():
             
             # Write simplified data as fallback
             fallback_file = f"{config.DATA_DIR}/simplified_data.json"
-            with open(fallback_file, "w", encoding="utf-8") as f:
-                json.dump(simplified_data, f, indent=4)
+            with open(fallback_file, "wb") as f:
+                f.write(orjson.dumps(simplified_data, option=orjson.OPT_INDENT_2))
             logging.info(f"Saved simplified data to {fallback_file}")
         
         # Print a summary
@@ -2,11 +2,18 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import config  # Import global reward values
-from transformers import BertModel, BertTokenizer
+from transformers import BertModel, BertTokenizerFast
 
-# Load pre-trained BERT model
-bert_model = BertModel.from_pretrained("bert-base-uncased")
-tokenizer = BertTokenizer.from_pretrained("bert-base-uncased")
+# Load pre-trained BERT model; it is only used as a frozen feature extractor,
+# so quantize its Linear layers to int8 for faster, lighter CPU inference
+bert_model = torch.quantization.quantize_dynamic(
+    BertModel.from_pretrained("bert-base-uncased"), {nn.Linear}, dtype=torch.qint8
+)
+bert_model.eval()
+tokenizer = BertTokenizerFast.from_pretrained("bert-base-uncased")
+
+# Rows per BERT forward pass when embedding the training set
+EMBED_BATCH_SIZE = 32
 
 # Define Reinforcement Learning Selector Model
 class SelectorAgent(nn.Module):
@@ -27,12 +34,22 @@ loss_fn = nn.CrossEntropyLoss()
 
 def train_agent(training_data):
     """Train RL agent using rewards from `config.py`."""
+    texts = [entry["html"] for entry in training_data]
+
+    # Tokenize the whole dataset in one batched call and embed it once up front;
+    # BERT is frozen, so the [CLS] embeddings are identical in every epoch.
+    # The forward pass runs in fixed-size slices to keep activation memory bounded.
+    tokens = tokenizer(texts, padding=True, truncation=True, max_length=512, return_tensors="pt")
+    chunks = []
+    with torch.no_grad():
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            batch = {key: value[start:start + EMBED_BATCH_SIZE] for key, value in tokens.items()}
+            chunks.append(bert_model(**batch)["last_hidden_state"][:, 0, :])
+    embeddings = torch.cat(chunks)
+
     for epoch in range(5):
-        for entry in training_data:
-            text = entry["html"]
-            tokens = tokenizer(text, return_tensors="pt")
-            embedding = bert_model(**tokens)["last_hidden_state"][:, 0, :]
-            prediction = agent(embedding)
+        for text, embedding in zip(texts, embeddings):
+            prediction = agent(embedding.unsqueeze(0))
 
             # Simulated feedback
             true_selector = "courses" if "course" in text.lower() else "admissions"
@@ -16,12 +16,17 @@ import sys
 import argparse
 from datetime import datetime
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
+
+from utils.result_utils import normalize_missing
 
 def load_data(file_path):
     """Load the scraped data from JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return normalize_missing(orjson.loads(f.read()))
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         sys.exit(1)
@@ -32,14 +37,14 @@ def load_data(file_path):
 def analyze_completion(data):
     """Analyze the completion rate for each data category."""
     total = len(data)
-    courses_found = sum(1 for uni in data if uni.get("courses") and uni["courses"][0] != "Not found")
-    req_found = sum(1 for uni in data if uni.get("admissions_requirements") and uni["admissions_requirements"][0] != "Not found")
-    deadlines_found = sum(1 for uni in data if uni.get("application_deadlines") and uni["application_deadlines"][0] != "Not found")
+    courses_found = sum(1 for uni in data if uni.get("courses"))
+    req_found = sum(1 for uni in data if uni.get("admissions_requirements"))
+    deadlines_found = sum(1 for uni in data if uni.get("application_deadlines"))
     
     all_found = sum(1 for uni in data if 
-                   uni.get("courses") and uni["courses"][0] != "Not found" and
-                   uni.get("admissions_requirements") and uni["admissions_requirements"][0] != "Not found" and
-                   uni.get("application_deadlines") and uni["application_deadlines"][0] != "Not found")
+                   uni.get("courses") and
+                   uni.get("admissions_requirements") and
+                   uni.get("application_deadlines"))
     
     return {
         "total_universities": total,
@@ -65,9 +70,9 @@ def analyze_data_quality(data):
     }
     
     # Calculate average lengths
-    course_lengths = [len(str(c)) for uni in data for c in uni.get("courses", []) if c != "Not found"]
-    req_lengths = [len(str(r)) for uni in data for r in uni.get("admissions_requirements", []) if r != "Not found"]
-    deadline_lengths = [len(str(d)) for uni in data for d in uni.get("application_deadlines", []) if d != "Not found"]
+    course_lengths = [len(str(c)) for uni in data for c in uni.get("courses") or []]
+    req_lengths = [len(str(r)) for uni in data for r in uni.get("admissions_requirements") or []]
+    deadline_lengths = [len(str(d)) for uni in data for d in uni.get("application_deadlines") or []]
     
     quality_metrics["avg_course_length"] = sum(course_lengths) / len(course_lengths) if course_lengths else 0
     quality_metrics["avg_requirements_length"] = sum(req_lengths) / len(req_lengths) if req_lengths else 0
@@ -86,25 +91,27 @@ def find_universities_with_issues(data):
     
     for uni in data:
         issues = []
+        courses = uni.get("courses")
+        requirements = uni.get("admissions_requirements")
         
         # Check for missing data categories
-        if not uni.get("courses") or uni["courses"][0] == "Not found":
+        if not courses:
             issues.append("Missing course information")
         
-        if not uni.get("admissions_requirements") or uni["admissions_requirements"][0] == "Not found":
+        if not requirements:
             issues.append("Missing admissions requirements")
             
-        if not uni.get("application_deadlines") or uni["application_deadlines"][0] == "Not found":
+        if not uni.get("application_deadlines"):
             issues.append("Missing application deadlines")
         
         # Check for potentially low-quality data
-        if uni.get("courses") and uni["courses"][0] != "Not found":
-            course_text = " ".join([str(c) for c in uni["courses"]])
+        if courses:
+            course_text = " ".join([str(c) for c in courses])
             if len(course_text) < 50:
                 issues.append("Very brief course information")
         
-        if uni.get("admissions_requirements") and uni["admissions_requirements"][0] != "Not found":
-            req_text = " ".join([str(r) for r in uni["admissions_requirements"]])
+        if requirements:
+            req_text = " ".join([str(r) for r in requirements])
             if len(req_text) < 50:
                 issues.append("Very brief admissions requirements")
         
@@ -119,9 +126,14 @@ def find_universities_with_issues(data):
 
 def generate_report(data, output_format="text"):
     """Generate the full report in the specified format."""
-    completion_metrics = analyze_completion(data)
-    quality_metrics = analyze_data_quality(data)
-    universities_with_issues = find_universities_with_issues(data)
+    # The three analyses are independent read-only passes over the data, so run them side by side
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        completion_future = executor.submit(analyze_completion, data)
+        quality_future = executor.submit(analyze_data_quality, data)
+        issues_future = executor.submit(find_universities_with_issues, data)
+        completion_metrics = completion_future.result()
+        quality_metrics = quality_future.result()
+        universities_with_issues = issues_future.result()
     
     report_data = {
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
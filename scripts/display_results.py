@@ -10,11 +10,28 @@ import os
 import sys
 from datetime import datetime
 
+import numpy as np
+import orjson
+
+# Shared helpers live at the repo root; this script is run as scripts/display_results.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.result_utils import DATA_KEYS, normalize_missing
+
+# Labels used when printing statistics for each category
+STAT_LABELS = {
+    "courses": "course info",
+    "course_descriptions": "course descriptions",
+    "admissions_requirements": "requirements info",
+    "application_deadlines": "deadline info",
+    "early_admission": "early admission info",
+    "regular_admission": "regular admission info",
+}
+
 def load_data(file_path):
     """Load the scraped data from JSON file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return normalize_missing(orjson.loads(f.read()))
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         # Check if file_path is a relative path and we need to check from the repo root
@@ -25,8 +42,8 @@ def load_data(file_path):
         
         if os.path.exists(alt_path):
             print(f"Found file at alternate path: {alt_path}")
-            with open(alt_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(alt_path, 'rb') as f:
+                return normalize_missing(orjson.loads(f.read()))
         sys.exit(1)
     except json.JSONDecodeError:
         print(f"Error: Invalid JSON in {file_path}")
@@ -51,21 +68,24 @@ def display_statistics(data):
         print("No universities data found.")
         return
         
-    found_courses = sum(1 for uni in data if uni.get("courses") and uni["courses"][0] != "Not found")
-    found_descriptions = sum(1 for uni in data if uni.get("course_descriptions") and uni["course_descriptions"][0] != "Not found")
-    found_requirements = sum(1 for uni in data if uni.get("admissions_requirements") and uni["admissions_requirements"][0] != "Not found")
-    found_deadlines = sum(1 for uni in data if uni.get("application_deadlines") and uni["application_deadlines"][0] != "Not found")
-    found_early = sum(1 for uni in data if uni.get("early_admission") and uni["early_admission"][0] != "Not found")
-    found_regular = sum(1 for uni in data if uni.get("regular_admission") and uni["regular_admission"][0] != "Not found")
-
     print("Scraping Statistics:")
     print(f"Total universities: {total_universities}")
-    print(f"Universities with course info: {found_courses}/{total_universities} ({found_courses/total_universities*100:.1f}%)")
-    print(f"Universities with course descriptions: {found_descriptions}/{total_universities} ({found_descriptions/total_universities*100:.1f}%)")
-    print(f"Universities with requirements info: {found_requirements}/{total_universities} ({found_requirements/total_universities*100:.1f}%)")
-    print(f"Universities with deadline info: {found_deadlines}/{total_universities} ({found_deadlines/total_universities*100:.1f}%)")
-    print(f"Universities with early admission info: {found_early}/{total_universities} ({found_early/total_universities*100:.1f}%)")
-    print(f"Universities with regular admission info: {found_regular}/{total_universities} ({found_regular/total_universities*100:.1f}%)")
+
+    # Only report categories the scraper actually wrote; absent keys would always count 0
+    present_keys = set().union(*(uni.keys() for uni in data[:10]))
+    stat_keys = [key for key in DATA_KEYS if key in present_keys]
+    if not stat_keys:
+        return
+
+    # Build one boolean matrix (universities x categories) and reduce it in a single pass
+    found = np.array(
+        [[uni.get(k) is not None for k in stat_keys] for uni in data],
+        dtype=bool
+    )
+    counts = found.sum(axis=0).tolist()
+
+    for key, count in zip(stat_keys, counts):
+        print(f"Universities with {STAT_LABELS[key]}: {count}/{total_universities} ({count/total_universities*100:.1f}%)")
 
 def main():
     """Main function to display scraped data."""
@@ -11,24 +11,58 @@ Emits: uk_institutions.csv (University Name, Fallback URL, Country Hint)
 
 If the detected admissions URL returns a non-200 status, the AdminURL field will fallback to the university's main site.
 """
+import asyncio
 import csv
+import re
 import time
-from urllib.parse import urljoin
+from collections import defaultdict, deque
+from urllib.parse import urljoin, urlparse
 
-import requests
+import aiohttp
 from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; UniversityAdmissionsBot/1.0)"
 }
 WIKI_BASE = "https://en.wikipedia.org"
-
-
-def get_official_site(wiki_href):
-    """Fetch a uni’s Wikipedia page and return its infobox Website link."""
-    resp = requests.get(urljoin(WIKI_BASE, wiki_href), headers=HEADERS, timeout=10)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+CONCURRENCY = 20  # Universities resolved at the same time
+TIMEOUT = aiohttp.ClientTimeout(total=10)
+HOST_RATE_LIMIT = 5     # Requests allowed per host ...
+HOST_RATE_WINDOW = 1.0  # ... within this many seconds
+_LINK_HINT = re.compile(r"admiss", re.I)
+
+# Official site by Wikipedia href; several list entries can point at the same article
+_SITE_CACHE = {}
+
+# Recent request times per host, so politeness applies only to the host being re-hit
+_HOST_REQUESTS = defaultdict(deque)
+_HOST_LOCKS = defaultdict(asyncio.Lock)
+
+
+async def throttle(url):
+    """Wait until a request to url's host fits within the per-host rate window."""
+    host = urlparse(url).netloc
+    async with _HOST_LOCKS[host]:
+        recent = _HOST_REQUESTS[host]
+        now = time.monotonic()
+        while recent and now - recent[0] >= HOST_RATE_WINDOW:
+            recent.popleft()
+        if len(recent) >= HOST_RATE_LIMIT:
+            await asyncio.sleep(HOST_RATE_WINDOW - (now - recent.popleft()))
+        recent.append(time.monotonic())
+
+
+async def fetch(session, url):
+    """GET a URL and return (status, text, final_url)."""
+    await throttle(url)
+    async with session.get(url) as resp:
+        return resp.status, await resp.text(), str(resp.url)
+
+
+def _parse_infobox_website(html):
+    """Return the Website link from a Wikipedia page's infobox, or ""."""
+    soup = BeautifulSoup(html, "lxml")
     infobox = soup.find("table", class_="infobox vcard")
     if not infobox:
         return ""
@@ -39,32 +73,77 @@ def get_official_site(wiki_href):
     return link["href"] if link and link.has_attr("href") else ""
 
 
-def find_admissions_page(base_url):
+def _parse_admissions_link(html, base_url):
+    """Return the first 'admiss' link on a page resolved against base_url, or None."""
+    tree = LexborHTMLParser(html)
+    for a in tree.css("a[href]"):
+        href = a.attributes.get("href") or ""
+        if _LINK_HINT.search(href) or _LINK_HINT.search(a.text(separator=" ")):
+            return urljoin(base_url, href)
+    return None
+
+
+async def get_official_site(session, wiki_href):
+    """Fetch a uni’s Wikipedia page and return its infobox Website link."""
+    if wiki_href in _SITE_CACHE:
+        return _SITE_CACHE[wiki_href]
+    status, text, _ = await fetch(session, urljoin(WIKI_BASE, wiki_href))
+    if status != 200:
+        return ""
+    # parse in a worker thread so other fetches keep flowing
+    site = await asyncio.to_thread(_parse_infobox_website, text)
+    _SITE_CACHE[wiki_href] = site
+    return site
+
+
+async def find_admissions_page(session, base_url):
     """Scrape homepage for an 'admiss' link; fallback to /admissions."""
     try:
-        resp = requests.get(base_url, headers=HEADERS, timeout=10)
-        resp.raise_for_status()
+        status, text, _ = await fetch(session, base_url)
     except Exception:
-        # fallback candidate
-        return base_url.rstrip("/") + "/admissions"
-    soup = BeautifulSoup(resp.text, "html.parser")
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        txt = a.get_text(" ").lower()
-        if "admiss" in href.lower() or "admiss" in txt:
-            return urljoin(base_url, href)
+        status = None
+    if status == 200:
+        link = await asyncio.to_thread(_parse_admissions_link, text, base_url)
+        if link:
+            return link
+    # fallback candidate
     return base_url.rstrip("/") + "/admissions"
 
 
-def validate_url(url):
+async def validate_url(session, url):
     """Return True if HEAD request gets status code 200, else False."""
     try:
-        resp = requests.head(url, headers=HEADERS, allow_redirects=True, timeout=10)
-        return resp.status_code == 200
+        await throttle(url)
+        async with session.head(url, allow_redirects=True) as resp:
+            return resp.status == 200
     except Exception:
         return False
 
 
+async def process_uni(sem, session, name, href):
+    """Resolve one institution to a CSV row, or None if it has no official site."""
+    async with sem:
+        try:
+            site = await get_official_site(session, href)
+        except Exception as e:
+            print(f"→ {name} … ⚠️ could not load Wikipedia page ({e}), skipping.")
+            return None
+        if not site:
+            print(f"→ {name} … ⚠️ no official site, skipping.")
+            return None
+
+        # find and validate admissions page
+        adm_candidate = await find_admissions_page(session, site)
+        if await validate_url(session, adm_candidate):
+            adm = adm_candidate
+            print(f"→ {name} … found valid admissions: {adm}")
+        else:
+            adm = site  # fallback to main site if admissions invalid
+            print(f"→ {name} … ⚠️ admissions URL invalid, using main site: {adm}")
+
+        return [name, adm, "UK"]
+
+
 def scrape_main_table(soup):
     table = soup.find(
         "table",
@@ -118,51 +197,56 @@ def scrape_other_recognised(soup):
     return items
 
 
-def main():
-    url = WIKI_BASE + "/wiki/List_of_universities_in_the_United_Kingdom"
-    resp = requests.get(url, headers=HEADERS, timeout=10)
-    resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
-
-    # scrape all three sections
+def parse_list_page(html):
+    """Parse the Wikipedia list page once and return (name, href) from all three sections."""
+    soup = BeautifulSoup(html, "lxml")
     entries = []
     entries += scrape_main_table(soup)
     entries += scrape_london_members(soup)
     entries += scrape_other_recognised(soup)
+    return entries
 
-    # dedupe by name
-    unis = {}
-    for name, href in entries:
-        if name not in unis:
-            unis[name] = href
+
+async def amain():
+    try:
+        resolver = aiohttp.AsyncResolver()  # uses aiodns when installed
+    except RuntimeError:
+        resolver = aiohttp.ThreadedResolver()
+    connector = aiohttp.TCPConnector(
+        limit=CONCURRENCY, use_dns_cache=True, ttl_dns_cache=600, resolver=resolver,
+        keepalive_timeout=30,  # keep Wikipedia / university connections warm between requests
+    )
+    async with aiohttp.ClientSession(connector=connector, timeout=TIMEOUT, headers=HEADERS) as session:
+        url = WIKI_BASE + "/wiki/List_of_universities_in_the_United_Kingdom"
+        status, text, _ = await fetch(session, url)
+        if status != 200:
+            raise RuntimeError(f"Failed to fetch {url}: HTTP {status}")
+
+        # scrape all three sections off the event loop
+        entries = await asyncio.to_thread(parse_list_page, text)
+
+        # dedupe by name
+        unis = {}
+        for name, href in entries:
+            if name not in unis:
+                unis[name] = href
+
+        # resolve universities concurrently; gather keeps the sorted input order
+        sem = asyncio.Semaphore(CONCURRENCY)
+        tasks = [process_uni(sem, session, name, href) for name, href in sorted(unis.items())]
+        rows = [row for row in await asyncio.gather(*tasks) if row]
 
     out_path = "uk_institutions.csv"
     with open(out_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow(["University Name", "Fallback URL", "Country Hint"])
+        writer.writerows(rows)
 
-        count = 0
-        for name, href in sorted(unis.items()):
-            print(f"→ {name} …", end=" ", flush=True)
-            site = get_official_site(href)
-            if not site:
-                print("⚠️ no official site, skipping.")
-                continue
+    print(f"\n✅ Done — wrote {len(rows)} institutions to {out_path}")
 
-            # find and validate admissions page
-            adm_candidate = find_admissions_page(site)
-            if validate_url(adm_candidate):
-                adm = adm_candidate
-                print("found valid admissions:", adm)
-            else:
-                adm = site  # fallback to main site if admissions invalid
-                print("⚠️ admissions URL invalid, using main site:", adm)
 
-            writer.writerow([name, adm, "UK"])
-            count += 1
-            time.sleep(0.5)
-
-        print(f"\n✅ Done — wrote {count} institutions to {out_path}")
+def main():
+    asyncio.run(amain())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import university_list_processor as ulp
+
+UNIVERSITIES = [
+    {"name": "Universität Zürich", "url": "https://www.uzh.ch/en/studies.html"},
+    {"name": "University of Leeds", "url": "https://www.leeds.ac.uk/admissions"},
+]
+
+
+def fake_resolver(records, fail_after=None):
+    async def resolve_universities(entries):
+        for i, record in enumerate(records):
+            if i == fail_after:
+                raise RuntimeError("network went away")
+            yield record
+    return resolve_universities
+
+
+@pytest.mark.parametrize("records", [[], UNIVERSITIES[:1], UNIVERSITIES])
+def test_write_universities_matches_indented_dump(tmp_path, monkeypatch, records):
+    monkeypatch.setattr(ulp, "resolve_universities", fake_resolver(records))
+    output_file = tmp_path / "universities.json"
+
+    count = asyncio.run(ulp.write_universities([], str(output_file)))
+
+    assert count == len(records)
+    assert output_file.read_bytes() == ulp.json_dumps_indented(records)
+    assert not os.path.exists(ulp.partial_output_file(str(output_file)))
+
+
+def test_write_universities_failure_keeps_previous_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(ulp, "resolve_universities", fake_resolver(UNIVERSITIES, fail_after=1))
+    output_file = tmp_path / "universities.json"
+    output_file.write_text('[{"name": "previous run"}]', encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(ulp.write_universities([], str(output_file)))
+
+    # The last good output is untouched and the partial file is still loadable JSON
+    assert json.loads(output_file.read_text(encoding="utf-8")) == [{"name": "previous run"}]
+    with open(ulp.partial_output_file(str(output_file)), encoding="utf-8") as f:
+        assert json.load(f) == UNIVERSITIES[:1]
+
+
+def test_host_lookup_timeout_is_probed_and_not_cached(monkeypatch):
+    async def run():
+        loop = asyncio.get_running_loop()
+
+        async def hanging_getaddrinfo(host, port):
+            await asyncio.sleep(1)
+
+        async def failing_getaddrinfo(host, port):
+            raise OSError("Name or service not known")
+
+        monkeypatch.setattr(ulp, "CONNECT_TIMEOUT", 0.01)
+        monkeypatch.setattr(ulp, "_HOST_LOOKUPS", {})
+        monkeypatch.setattr(ulp, "_DNS_LOOKUP_SEMAPHORE", asyncio.Semaphore(ulp.DNS_LOOKUP_CONCURRENCY))
+
+        monkeypatch.setattr(loop, "getaddrinfo", hanging_getaddrinfo)
+        assert await ulp.host_resolves("slow.example.edu") is True
+        assert "slow.example.edu" not in ulp._HOST_LOOKUPS
+
+        monkeypatch.setattr(loop, "getaddrinfo", failing_getaddrinfo)
+        assert await ulp.host_resolves("missing.example.edu") is False
+        assert "missing.example.edu" in ulp._HOST_LOOKUPS
+
+    asyncio.run(run())
+
+
+def wikidata_item(instance_of=(), subclass_of=(), country=None, website=None):
+    def claims(prop, values):
+        return {prop: [{"mainsnak": {"datavalue": {"value": value}}} for value in values]}
+    item = {}
+    item.update(claims("P31", [{"id": class_id} for class_id in instance_of]))
+    item.update(claims("P279", [{"id": class_id} for class_id in subclass_of]))
+    item.update(claims("P17", [{"id": country}] if country else []))
+    item.update(claims("P856", [website] if website else []))
+    return {"claims": item}
+
+
+WIKIDATA = {
+    # A film sharing the university's name ranks first in search
+    "Q1": wikidata_item(instance_of=["Q11424"], website="https://film.example.com"),
+    "Q2": wikidata_item(instance_of=["Q875538"], country="Q30", website="https://www.example.edu"),
+    "Q3": wikidata_item(instance_of=["Q3918"], country="Q145", website="https://www.example.ac.uk"),
+    # public university -> university; film -> visual artwork
+    "Q875538": wikidata_item(subclass_of=["Q3918"]),
+    "Q11424": wikidata_item(subclass_of=["Q4502142"]),
+    "Q4502142": wikidata_item(),
+}
+
+
+@pytest.mark.parametrize("country_hint, expected", [
+    (None, "https://www.example.edu"),
+    ("UK", "https://www.example.ac.uk"),
+    ("Canada", None),
+])
+def test_official_website_requires_university_in_hinted_country(monkeypatch, country_hint, expected):
+    async def fake_wikidata_get(session, params):
+        if params["action"] == "wbsearchentities":
+            return {"search": [{"id": "Q1"}, {"id": "Q2"}, {"id": "Q3"}]}
+        return {"entities": {item_id: WIKIDATA[item_id] for item_id in params["ids"].split("|")}}
+
+    monkeypatch.setattr(ulp, "_wikidata_get", fake_wikidata_get)
+    monkeypatch.setattr(ulp, "_UNIVERSITY_CLASS_CACHE", {})
+
+    assert asyncio.run(ulp.official_website(None, "Example University", country_hint)) == expected
+
+
+def test_verify_url_persists_only_definitive_outcomes(monkeypatch):
+    from aiohttp import web
+
+    async def page(request):
+        return web.Response(text="<title>Admissions</title><p>How to apply</p>", content_type="text/html")
+
+    async def missing(request):
+        raise web.HTTPNotFound()
+
+    async def rate_limited(request):
+        raise web.HTTPTooManyRequests()
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/admissions", page)
+        app.router.add_get("/missing", missing)
+        app.router.add_get("/busy", rate_limited)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        base_url = "http://127.0.0.1:%d" % runner.addresses[0][1]
+        try:
+            async with ulp.aiohttp.ClientSession() as session:
+                for path in ("/admissions", "/missing", "/busy"):
+                    await ulp.verify_url(session, base_url + path)
+        finally:
+            await runner.cleanup()
+        return base_url
+
+    monkeypatch.setattr(ulp, "_VERIFY_CACHE", {})
+    monkeypatch.setattr(ulp, "_VERIFY_PROBED_AT", {})
+    base_url = asyncio.run(run())
+
+    assert ulp._VERIFY_CACHE[base_url + "/admissions"] == (True, base_url + "/admissions")
+    assert ulp._VERIFY_CACHE[base_url + "/busy"] == (False, None)
+    assert set(ulp._VERIFY_PROBED_AT) == {base_url + "/admissions", base_url + "/missing"}
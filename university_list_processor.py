@@ -16,17 +16,30 @@ Usage:
 """
 
 import argparse
+import asyncio
 import csv
+import functools
+import itertools
 import json
 import logging
 import os
 import re
+import shelve
 import sys
+import time
+import unicodedata
 import urllib.parse
-from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from typing import AsyncIterator, DefaultDict, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+
+# orjson is optional: it only speeds up JSON encoding/decoding, and the output is identical either way
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -35,6 +48,61 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S"
 )
 
+# Request headers used when probing candidate pages
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# HEAD responses meaning "method not supported" rather than "page missing"
+HEAD_UNSUPPORTED_STATUSES = {405, 501}
+
+# Responses that settle a candidate as missing; other failures (403, 429, 5xx, timeouts) may be transient
+MISSING_PAGE_STATUSES = {404, 410}
+
+# Seconds to keep resolved hostnames in the connector's DNS cache
+DNS_CACHE_TTL = 600
+
+# Seconds an idle pooled connection is kept open for reuse by later probes to the same host
+KEEPALIVE_TIMEOUT = 30
+# Guessed domains often do not resolve; fail fast on connect instead of waiting out the full budget
+CONNECT_TIMEOUT = 3
+READ_TIMEOUT = 5
+# Consecutive connection failures after which a host is skipped for the rest of the run
+DEAD_HOST_THRESHOLD = 3
+# Candidate hostname lookups in flight at once (see host_resolves)
+DNS_LOOKUP_CONCURRENCY = 4
+# verify_url only needs <title> and the first few <p>; stop downloading after this many bytes
+VERIFY_MAX_BYTES = 64 * 1024
+VERIFY_CHUNK_SIZE = 8192
+# ... or as soon as this many paragraphs have closed, since later ones are never scored
+VERIFY_MAX_PARAGRAPHS = 5
+# Search-fallback results persisted across runs, keyed by university name and country hint
+SEARCH_CACHE_FILE = os.path.join("data", "search_cache")
+WIKIDATA_API = "https://www.wikidata.org/w/api.php"
+WIKIDATA_SEARCH_LIMIT = 5
+WIKIDATA_IDS_PER_REQUEST = 50  # wbgetentities maximum
+# The Wikidata fallback only accepts items that are instances of these classes (or their subclasses,
+# up to WIKIDATA_SUBCLASS_DEPTH levels up): university, higher education institution
+UNIVERSITY_CLASSES = {"Q3918", "Q38723"}
+WIKIDATA_SUBCLASS_DEPTH = 3
+# Country items (P17) matched against the country hint
+COUNTRY_HINT_WIKIDATA_IDS = {
+    "uk": "Q145", "united kingdom": "Q145", "england": "Q145", "scotland": "Q145",
+    "wales": "Q145", "northern ireland": "Q145",
+    "us": "Q30", "usa": "Q30", "united states": "Q30", "america": "Q30",
+    "au": "Q408", "australia": "Q408",
+    "ca": "Q16", "canada": "Q16",
+}
+# Definitive verify_url results persisted across runs; missing pages expire sooner so they get re-probed
+VERIFY_CACHE_FILE = os.path.join("data", "verify_cache")
+VERIFY_CACHE_TTL = 7 * 24 * 3600
+VERIFY_NEGATIVE_TTL = 24 * 3600
+
+# Number of universities resolved at the same time
+MAX_CONCURRENT_UNIVERSITIES = 5
+
 # Common URL patterns for university admissions pages
 ADMISSION_URL_PATTERNS = [
     "{base_url}/admissions",
@@ -48,6 +116,10 @@ ADMISSION_URL_PATTERNS = [
     "{base_url}/admissions/freshman",
     "{base_url}/future-students",
 ]
+# Every pattern is "{base_url}" plus a path, so candidates are built by plain concatenation
+ADMISSION_URL_PATHS = tuple(pattern.replace("{base_url}", "", 1) for pattern in ADMISSION_URL_PATTERNS)
+# The first path on this many of the likeliest domains is raced on its own before the full grid
+PRIORITY_CANDIDATES = 3
 
 # Common domain patterns for universities
 DOMAIN_PATTERNS = [
@@ -120,7 +192,6 @@ KNOWN_UNIVERSITIES = {
     "university of manchester": "www.manchester.ac.uk/study/undergraduate/applications",
     "university of bristol": "www.bristol.ac.uk/study/undergraduate/apply",
     "king's college london": "www.kcl.ac.uk/study-at-kings/undergraduate/how-to-apply",
-    "kings college london": "www.kcl.ac.uk/study-at-kings/undergraduate/how-to-apply",
     "university of warwick": "warwick.ac.uk/study/undergraduate/apply",
     "warwick": "warwick.ac.uk/study/undergraduate/apply",
     
@@ -142,37 +213,88 @@ KNOWN_UNIVERSITIES = {
     "nus": "www.nus.edu.sg/admissions",
 }
 
+# Common words in university names and their slug replacements
+SLUG_REPLACEMENTS = {
+    "university": "u",
+    "institute": "inst",
+    "technology": "tech",
+    "college": "coll",
+    "of": "",
+    "and": "",
+    "the": "",
+}
+# All replacements in one alternation so the name is scanned once, not once per word
+SLUG_WORD_RE = re.compile(r'\b(' + '|'.join(map(re.escape, SLUG_REPLACEMENTS)) + r')\b')
+NON_ALNUM_RE = re.compile(r'[^a-z0-9]+')
+
+# Keywords that mark a page as admissions-related, matched case-insensitively in one scan per text.
+# Longest alternatives come first so a longer keyword wins at the same position.
+ADMISSION_KEYWORDS = ('admission', 'apply', 'application', 'undergraduate', 'freshman', 'prospective', 'student')
+UK_ADMISSION_KEYWORDS = ADMISSION_KEYWORDS + ('studying', 'study', 'courses', 'ucas', 'entry requirements')
+
+def _keyword_regex(keywords: Iterable[str]) -> re.Pattern:
+    return re.compile('|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))), re.I)
+
+ADMISSION_KEYWORD_RE = _keyword_regex(ADMISSION_KEYWORDS)
+UK_ADMISSION_KEYWORD_RE = _keyword_regex(UK_ADMISSION_KEYWORDS)
+# URL terms that mark a page as admissions-related even when its text does not
+_URL_HINT = re.compile(r'admission|apply|undergraduate', re.I)
+# Raw <title> contents, read straight from the response bytes
+_RAW_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title', re.I | re.S)
+_RAW_P_CLOSE_RE = re.compile(rb'</p\s*>', re.I)
+
+# Verification results by candidate URL; many guessed URLs recur across universities
+_VERIFY_CACHE: Dict[str, Tuple[bool, Optional[str]]] = {}
+# When each URL got a definitive result during this run, for writing back to VERIFY_CACHE_FILE
+_VERIFY_PROBED_AT: Dict[str, float] = {}
+
+# Circuit breaker state: consecutive connection failures per host, and hosts given up on
+_HOST_FAILURES: DefaultDict[str, int] = defaultdict(int)
+_DEAD_HOSTS: Set[str] = set()
+
+# Whether a Wikidata class is (a subclass of) one of UNIVERSITY_CLASSES
+_UNIVERSITY_CLASS_CACHE: Dict[str, bool] = {}
+
+# One DNS lookup per hostname for the run; most guessed domains do not exist
+_HOST_LOOKUPS: Dict[str, "asyncio.Task[Optional[bool]]"] = {}
+# getaddrinfo runs in the default thread pool, which parsing (and the threaded resolver) share;
+# bounding lookups keeps them from queueing there, so the timeout measures the lookup itself
+_DNS_LOOKUP_SEMAPHORE = asyncio.Semaphore(DNS_LOOKUP_CONCURRENCY)
+
+@functools.lru_cache(maxsize=4096)
 def create_name_slug(university_name: str) -> str:
-    """Generate a URL-friendly slug from a university name."""
-    # Replace common words in university names
-    replacements = {
-        "university": "u",
-        "institute": "inst",
-        "technology": "tech",
-        "college": "coll",
-        "of": "",
-        "and": "",
-        "the": "",
-    }
-    
+    """Generate a URL-friendly slug from a university name (memoized; names recur across calls)."""
     # Apply replacements
-    name_lower = university_name.lower()
-    for old, new in replacements.items():
-        name_lower = re.sub(r'\b' + old + r'\b', new, name_lower)
+    name_lower = SLUG_WORD_RE.sub(lambda m: SLUG_REPLACEMENTS[m.group(1)], university_name.lower())
     
     # Remove special characters and create slug
-    name_slug = re.sub(r'[^a-z0-9]+', '', name_lower)
+    name_slug = NON_ALNUM_RE.sub('', name_lower)
     
     return name_slug
 
-def guess_university_url(university_name: str, country_hint: Optional[str] = None) -> List[str]:
-    """Generate potential URLs for a university based on its name and optional country hint."""
-    potential_urls = []
-    
+def normalize_name(name: str) -> str:
+    """Reduce a university name to its ASCII slug for spelling-insensitive lookups."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return create_name_slug(ascii_name)
+
+# KNOWN_UNIVERSITIES keyed by slug, so "King's College London", "kings  college london"
+# (or a Unicode apostrophe) and "The Harvard University" / "Harvard University" hit the same entry
+KNOWN_BY_SLUG = {normalize_name(name): domain for name, domain in KNOWN_UNIVERSITIES.items()}
+
+def known_university_url(university_name: str) -> Optional[str]:
+    """Return the curated admissions URL for a known university, if any."""
+    domain = KNOWN_BY_SLUG.get(normalize_name(university_name))
+    return f"https://{domain}" if domain else None
+
+def guess_university_url(university_name: str, country_hint: Optional[str] = None) -> Iterator[str]:
+    """Lazily generate potential URLs for a university based on its name and optional country hint."""
     # Check if this is a known university
+    known_url = known_university_url(university_name)
+    if known_url:
+        yield known_url
+        return
+    
     name_lower = university_name.lower()
-    if name_lower in KNOWN_UNIVERSITIES:
-        return [f"https://{KNOWN_UNIVERSITIES[name_lower]}"]
     
     # Create name slug
     name_slug = create_name_slug(university_name)
@@ -228,115 +350,362 @@ def guess_university_url(university_name: str, country_hint: Optional[str] = Non
             domains.append(f"{location_slug}.ac.uk")
             domains.append(f"www.{location_slug}.ac.uk")
     
+    # Drop repeated domains while keeping priority order (e.g. the "University of X" slug
+    # often equals the main slug); patterns are unique, so the URLs below are too
+    domains = list(dict.fromkeys(domains))
+    
+    # The most common admissions path on the likeliest domains comes first (see PRIORITY_CANDIDATES)
+    priority_urls = [f"https://{domain}{ADMISSION_URL_PATHS[0]}" for domain in domains[:PRIORITY_CANDIDATES]]
+    yield from priority_urls
+    
     # Generate full URLs using domains and admission URL patterns
     for domain in domains:
         base_url = f"https://{domain}"
-        for pattern in ADMISSION_URL_PATTERNS:
-            potential_urls.append(pattern.format(base_url=base_url))
+        for path in ADMISSION_URL_PATHS:
+            url = base_url + path
+            if url not in priority_urls:
+                yield url
+
+def json_loads(data: bytes):
+    """Decode JSON bytes, with orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def json_dumps_indented(obj) -> bytes:
+    """Encode obj as UTF-8 JSON indented by two spaces, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _count_keywords(keyword_re: re.Pattern, text: str) -> int:
+    """Count the distinct keywords (case-insensitively) that keyword_re finds in text."""
+    return len({match.lower() for match in keyword_re.findall(text)})
+
+def _parse_verify(html: bytes, url: str, final_url: str) -> Tuple[bool, Optional[str]]:
+    """Score a fetched page for admissions keywords; returns (is_valid, final_url)."""
+    # For UK universities, also check for UK-specific terms
+    keyword_re = UK_ADMISSION_KEYWORD_RE if "ac.uk" in url else ADMISSION_KEYWORD_RE
+    
+    # A title that already qualifies on its own needs no DOM at all
+    raw_title = _RAW_TITLE_RE.search(html)
+    if raw_title and _count_keywords(keyword_re, raw_title.group(1).decode('utf-8', 'replace')) >= 2:
+        return True, final_url
+    
+    tree = LexborHTMLParser(html)
+    
+    # Check if this is likely an admissions page
+    title = tree.css_first('title')
+    title_text = title.text() if title else ""
+    body_text = " ".join(p.text() for p in tree.css('p')[:5])
     
-    return potential_urls
+    # Count how many distinct admission-related keywords appear in the title and body
+    keyword_count = _count_keywords(keyword_re, title_text) + _count_keywords(keyword_re, body_text)
+    
+    if keyword_count >= 2:
+        return True, final_url
+    
+    # Fallback - if URL contains admissions-related terms, return it anyway
+    if _URL_HINT.search(final_url):
+        return True, final_url
+        
+    return False, None
+
+def _verify_entry_expired(is_valid: bool, checked_at: float, now: float) -> bool:
+    return now - checked_at >= (VERIFY_CACHE_TTL if is_valid else VERIFY_NEGATIVE_TTL)
+
+def load_verify_cache() -> None:
+    """Seed the in-memory verify cache with unexpired results from previous runs."""
+    now = time.time()
+    try:
+        with shelve.open(VERIFY_CACHE_FILE, flag='r') as cache:
+            for url, (is_valid, final_url, checked_at) in cache.items():
+                if not _verify_entry_expired(is_valid, checked_at, now):
+                    _VERIFY_CACHE[url] = (is_valid, final_url)
+    except Exception:
+        # No cache file yet (first run) or it is unreadable
+        return
+    logging.debug(f"Loaded {len(_VERIFY_CACHE)} cached URL verifications")
 
-def verify_url(url: str, timeout: int = 5) -> Tuple[bool, Optional[str]]:
-    """Verify if a URL exists and is an admissions page."""
+def save_verify_cache() -> None:
+    """Write this run's probe results to disk and drop expired entries."""
+    now = time.time()
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml",
-            "Accept-Language": "en-US,en;q=0.9",
-        }
+        os.makedirs(os.path.dirname(VERIFY_CACHE_FILE), exist_ok=True)
+        with shelve.open(VERIFY_CACHE_FILE) as cache:
+            for url, checked_at in _VERIFY_PROBED_AT.items():
+                cache[url] = (*_VERIFY_CACHE[url], checked_at)
+            expired = [url for url, (is_valid, _, checked_at) in cache.items()
+                       if _verify_entry_expired(is_valid, checked_at, now)]
+            for url in expired:
+                del cache[url]
+    except Exception as e:
+        logging.debug(f"Could not update verify cache: {e}")
+
+async def verify_url(session: aiohttp.ClientSession, url: str, timeout: int = 5) -> Tuple[bool, Optional[str]]:
+    """Verify if a URL exists and is an admissions page (memoized per URL, persisted across runs)."""
+    cached = _VERIFY_CACHE.get(url)
+    if cached is not None:
+        return cached
+    if urllib.parse.urlparse(url).netloc in _DEAD_HOSTS:
+        return False, None
+    is_valid, final_url, definitive = await _probe_url(session, url, timeout)
+    result = (is_valid, final_url)
+    _VERIFY_CACHE[url] = result
+    if definitive:
+        # Only settled outcomes are persisted; a flaky or rate-limited run must not blacklist candidates
+        _VERIFY_PROBED_AT[url] = time.time()
+    return result
+
+async def _probe_url(session: aiohttp.ClientSession, url: str, timeout: int) -> Tuple[bool, Optional[str], bool]:
+    """Fetch and score a candidate URL without consulting the cache.
+    
+    Returns (is_valid, final_url, definitive), where definitive is False for outcomes that may be
+    transient (timeouts, connection errors, 403/429/5xx responses).
+    """
+    host = urllib.parse.urlparse(url).netloc
+    try:
+        client_timeout = aiohttp.ClientTimeout(total=timeout, sock_connect=CONNECT_TIMEOUT, sock_read=READ_TIMEOUT)
         
-        response = requests.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+        # A cheap HEAD weeds out dead candidates (mostly 404s) without downloading a body
+        async with session.head(url, timeout=client_timeout, allow_redirects=True) as response:
+            head_status = response.status
+            # Check if redirected to a different URL
+            final_url = str(response.url)
+        _HOST_FAILURES.pop(host, None)
         
-        # Check if redirected to a different URL
-        final_url = response.url
+        if head_status in HEAD_UNSUPPORTED_STATUSES:
+            # Server rejects HEAD; let the GET below decide
+            final_url = url
+        elif head_status != 200:
+            return False, None, head_status in MISSING_PAGE_STATUSES
+        elif _URL_HINT.search(final_url):
+            # The URL alone already qualifies (see _parse_verify), so skip the body download
+            return True, final_url, True
         
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Check if this is likely an admissions page
-            title_text = soup.title.text.lower() if soup.title else ""
-            body_text = " ".join([p.text.lower() for p in soup.find_all('p', limit=5)])
+        async with session.get(final_url, timeout=client_timeout, allow_redirects=True) as response:
+            final_url = str(response.url)
             
-            admission_keywords = ['admission', 'apply', 'application', 'undergraduate', 'freshman', 'prospective', 'student']
+            if response.status != 200:
+                return False, None, response.status in MISSING_PAGE_STATUSES
             
-            # For UK universities, also check for these terms
-            if "ac.uk" in url:
-                admission_keywords.extend(['studying', 'study', 'courses', 'UCAS', 'entry requirements'])
-            
-            # Count how many admission-related keywords appear in the title and body
-            keyword_count = sum(1 for keyword in admission_keywords if keyword in title_text)
-            keyword_count += sum(1 for keyword in admission_keywords if keyword in body_text)
-            
-            if keyword_count >= 2:
-                return True, final_url
-            
-            # Fallback - if URL contains admissions-related terms, return it anyway
-            if any(keyword in final_url.lower() for keyword in ['admission', 'apply', 'undergraduate']):
-                return True, final_url
-                
-            return False, None
-        return False, None
+            # Stream the body and stop once we have enough for the head and opening paragraphs
+            html = b""
+            async for chunk in response.content.iter_chunked(VERIFY_CHUNK_SIZE):
+                html += chunk
+                if len(html) >= VERIFY_MAX_BYTES or len(_RAW_P_CLOSE_RE.findall(html)) >= VERIFY_MAX_PARAGRAPHS:
+                    break
+        
+        # Parse in a worker thread so the event loop keeps servicing other probes
+        is_valid, final_url = await asyncio.to_thread(_parse_verify, html, url, final_url)
+        return is_valid, final_url, True
+    except aiohttp.ClientConnectorError as e:
+        # DNS failure or refused connection: count it against the host
+        _HOST_FAILURES[host] += 1
+        if _HOST_FAILURES[host] >= DEAD_HOST_THRESHOLD and host not in _DEAD_HOSTS:
+            _DEAD_HOSTS.add(host)
+            logging.debug(f"Marking {host} as dead after {_HOST_FAILURES[host]} connection failures")
+        logging.debug(f"Error verifying {url}: {e}")
+        return False, None, False
     except Exception as e:
         logging.debug(f"Error verifying {url}: {e}")
-        return False, None
+        return False, None, False
+
+async def _lookup_host(hostname: str) -> Optional[bool]:
+    """Resolve hostname; None means the lookup timed out, so the answer is unknown."""
+    async with _DNS_LOOKUP_SEMAPHORE:
+        try:
+            await asyncio.wait_for(asyncio.get_running_loop().getaddrinfo(hostname, None), CONNECT_TIMEOUT)
+            return True
+        except asyncio.TimeoutError:
+            return None
+        except OSError:
+            return False
+
+async def host_resolves(hostname: Optional[str]) -> bool:
+    """Return whether a hostname may resolve, looking each one up only once per run.
+    
+    Only definite answers are remembered; a lookup that times out counts as resolving
+    (the HTTP probe decides) and is retried the next time the hostname comes up.
+    """
+    if not hostname:
+        return False
+    lookup = _HOST_LOOKUPS.get(hostname)
+    if lookup is None:
+        lookup = _HOST_LOOKUPS[hostname] = asyncio.create_task(_lookup_host(hostname))
+    # Shielded so a cancelled caller doesn't cancel a lookup other callers share
+    resolves = await asyncio.shield(lookup)
+    if resolves is None:
+        if _HOST_LOOKUPS.get(hostname) is lookup:
+            del _HOST_LOOKUPS[hostname]
+        return True
+    return resolves
+
+async def first_valid_url(session: aiohttp.ClientSession, urls: Iterable[str]) -> Optional[str]:
+    """Probe candidate URLs concurrently and return the first one that verifies, cancelling the rest."""
+    urls = list(urls)
+    
+    # Cheap DNS pass first: candidates on hostnames that don't resolve never get an HTTP probe
+    hostnames = list({urllib.parse.urlparse(url).hostname for url in urls})
+    resolves = dict(zip(hostnames, await asyncio.gather(*(host_resolves(hostname) for hostname in hostnames))))
+    urls = [url for url in urls if resolves[urllib.parse.urlparse(url).hostname]]
+    
+    tasks = [asyncio.create_task(verify_url(session, url)) for url in urls]
+    logging.debug(f"Probing {len(tasks)} candidate URLs")
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            is_valid, final_url = await next_done
+            if is_valid:
+                return final_url
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def _wikidata_get(session: aiohttp.ClientSession, params: Dict[str, str]) -> dict:
+    """Call the Wikidata API and return its decoded JSON response ({} on an HTTP error)."""
+    async with session.get(WIKIDATA_API, params={**params, "format": "json"}, timeout=aiohttp.ClientTimeout(total=10)) as response:
+        if response.status != 200:
+            return {}
+        return json_loads(await response.read())
+
+async def _wikidata_entities(session: aiohttp.ClientSession, ids: Iterable[str]) -> Dict[str, dict]:
+    """Fetch the claims of Wikidata items by ID."""
+    ids = sorted(ids)
+    entities = {}
+    for start in range(0, len(ids), WIKIDATA_IDS_PER_REQUEST):
+        data = await _wikidata_get(session, {"action": "wbgetentities", "props": "claims",
+                                             "ids": "|".join(ids[start:start + WIKIDATA_IDS_PER_REQUEST])})
+        entities.update(data.get("entities", {}))
+    return entities
+
+def _claim_values(entity: dict, prop: str) -> List:
+    """Return the values of an item's claims for a property, skipping "no value"/"unknown value" claims."""
+    values = []
+    for claim in entity.get("claims", {}).get(prop, []):
+        value = claim.get("mainsnak", {}).get("datavalue", {}).get("value")
+        if value:
+            values.append(value["id"] if isinstance(value, dict) else value)
+    return values
+
+async def _university_classes(session: aiohttp.ClientSession, class_ids: Set[str]) -> Set[str]:
+    """Return the classes in class_ids that are UNIVERSITY_CLASSES or subclasses of one (via P279)."""
+    parents: Dict[str, List[str]] = {}
+    frontier = {class_id for class_id in class_ids if class_id not in _UNIVERSITY_CLASS_CACHE} - UNIVERSITY_CLASSES
+    for _ in range(WIKIDATA_SUBCLASS_DEPTH):
+        if not frontier:
+            break
+        entities = await _wikidata_entities(session, frontier)
+        for class_id in frontier:
+            parents[class_id] = _claim_values(entities.get(class_id, {}), "P279")
+        frontier = {parent for class_id in frontier for parent in parents[class_id]} - parents.keys() - UNIVERSITY_CLASSES
+    
+    def is_university_class(class_id: str, seen: Set[str]) -> bool:
+        if class_id in UNIVERSITY_CLASSES:
+            return True
+        if class_id in _UNIVERSITY_CLASS_CACHE:
+            return _UNIVERSITY_CLASS_CACHE[class_id]
+        seen.add(class_id)
+        return any(is_university_class(parent, seen) for parent in parents.get(class_id, []) if parent not in seen)
+    
+    for class_id in class_ids:
+        _UNIVERSITY_CLASS_CACHE[class_id] = is_university_class(class_id, set())
+    return {class_id for class_id in class_ids if _UNIVERSITY_CLASS_CACHE[class_id]}
+
+async def official_website(session: aiohttp.ClientSession, university_name: str, country_hint: Optional[str] = None) -> Optional[str]:
+    """Look up a university's official website (Wikidata property P856) through the Wikidata JSON API.
+    
+    Only items that are instances of a university class count. With a recognised country hint the
+    item must also be in that country; without one, the best-ranked university match is used.
+    """
+    data = await _wikidata_get(session, {"action": "wbsearchentities", "search": university_name, "language": "en",
+                                         "type": "item", "limit": str(WIKIDATA_SEARCH_LIMIT)})
+    match_ids = [match["id"] for match in data.get("search", [])]
+    if not match_ids:
+        return None
+    
+    entities = await _wikidata_entities(session, match_ids)
+    instance_of = {item_id: set(_claim_values(entities.get(item_id, {}), "P31")) for item_id in match_ids}
+    university_classes = await _university_classes(session, set().union(*instance_of.values()))
+    country_id = COUNTRY_HINT_WIKIDATA_IDS.get(country_hint.lower()) if country_hint else None
+    
+    # Search results come best match first
+    for item_id in match_ids:
+        entity = entities.get(item_id, {})
+        if not instance_of[item_id] & university_classes:
+            continue
+        if country_id and country_id not in _claim_values(entity, "P17"):
+            continue
+        websites = _claim_values(entity, "P856")
+        if websites:
+            return websites[0]
+    return None
+
+def _search_cache_key(university_name: str, country_hint: Optional[str]) -> str:
+    # Prefixed with the lookup source, so results cached by earlier, unfiltered lookups are ignored
+    return f"wikidata-university|{university_name}|{country_hint or ''}"
+
+def cached_search_url(university_name: str, country_hint: Optional[str]) -> Optional[str]:
+    """Return the URL found by a previous run's search fallback, if any."""
+    try:
+        with shelve.open(SEARCH_CACHE_FILE, flag='r') as cache:
+            return cache.get(_search_cache_key(university_name, country_hint))
+    except Exception:
+        # No cache file yet (first run) or it is unreadable
+        return None
+
+def store_search_url(university_name: str, country_hint: Optional[str], url: str) -> None:
+    """Remember a search-fallback result so reruns skip the search."""
+    try:
+        os.makedirs(os.path.dirname(SEARCH_CACHE_FILE), exist_ok=True)
+        with shelve.open(SEARCH_CACHE_FILE) as cache:
+            cache[_search_cache_key(university_name, country_hint)] = url
+    except Exception as e:
+        logging.debug(f"Could not update search cache: {e}")
 
-def find_best_url(university_name: str, fallback_url: Optional[str] = None, country_hint: Optional[str] = None) -> Optional[str]:
+async def find_best_url(session: aiohttp.ClientSession, university_name: str, fallback_url: Optional[str] = None, country_hint: Optional[str] = None) -> Optional[str]:
     """Find the best admissions URL for a university using multiple strategies."""
+    # The curated list is trustworthy, so known universities skip all network checks
+    known_url = known_university_url(university_name)
+    if known_url:
+        logging.info(f"Using known admissions URL for '{university_name}': {known_url}")
+        return known_url
+    
     # If a fallback URL is provided, verify it first
     if fallback_url:
         logging.info(f"Checking fallback URL for '{university_name}': {fallback_url}")
-        is_valid, final_url = verify_url(fallback_url)
+        is_valid, final_url = await verify_url(session, fallback_url)
         if is_valid:
             logging.info(f"Fallback URL is valid for '{university_name}': {final_url}")
             return final_url
         logging.warning(f"Fallback URL is not valid for '{university_name}', trying alternatives")
     
     # Try guessing URLs based on university name and country hint
-    potential_urls = guess_university_url(university_name, country_hint)
+    logging.info(f"Checking potential URLs for '{university_name}'")
     
-    logging.info(f"Checking {len(potential_urls)} potential URLs for '{university_name}'")
+    # Race the few likeliest candidates first; only if none verifies, probe the rest at once
+    candidates = guess_university_url(university_name, country_hint)
+    final_url = (await first_valid_url(session, itertools.islice(candidates, PRIORITY_CANDIDATES))
+                 or await first_valid_url(session, candidates))
+    if final_url:
+        logging.info(f"Found valid URL for '{university_name}': {final_url}")
+        return final_url
     
-    # Try each URL and return the first valid one
-    for url in potential_urls:
-        logging.debug(f"Checking URL: {url}")
-        is_valid, final_url = verify_url(url)
-        if is_valid:
-            logging.info(f"Found valid URL for '{university_name}': {final_url}")
-            return final_url
+    # If no URL is valid, reuse a previous run's search result before searching again
+    final_url = cached_search_url(university_name, country_hint)
+    if final_url:
+        logging.info(f"Using cached search result for '{university_name}': {final_url}")
+        return final_url
     
-    # If no URL is valid, try a Google search (simplified version)
+    # Look up the official website in Wikidata (structured JSON, no results page to scrape)
+    # and probe the usual admissions paths under it
     try:
-        search_query = f"{university_name} university admissions undergraduate"
-        if country_hint:
-            search_query += f" {country_hint}"
-            
-        search_url = f"https://www.google.com/search?q={urllib.parse.quote(search_query)}"
-        
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-        }
-        
-        response = requests.get(search_url, headers=headers, timeout=10)
-        
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract links from search results
-            links = []
-            for a in soup.select('a'):
-                href = a.get('href', '')
-                if '/url?q=' in href and not 'google' in href:
-                    # Extract URL from Google's redirect URL
-                    url = href.split('/url?q=')[1].split('&')[0]
-                    url = urllib.parse.unquote(url)
-                    links.append(url)
-            
-            # Check each link
-            for link in links[:3]:  # Check only first 3 links
-                is_valid, final_url = verify_url(link)
-                if is_valid:
-                    logging.info(f"Found valid URL from search for '{university_name}': {final_url}")
-                    return final_url
+        website = await official_website(session, university_name, country_hint)
+        if website:
+            base_url = website.rstrip('/')
+            final_url = await first_valid_url(session, (base_url + path for path in ADMISSION_URL_PATHS))
+            if final_url:
+                logging.info(f"Found valid URL from search for '{university_name}': {final_url}")
+                store_search_url(university_name, country_hint, final_url)
+                return final_url
     except Exception as e:
         logging.warning(f"Error during search for '{university_name}': {e}")
     
@@ -355,9 +724,83 @@ def find_best_url(university_name: str, fallback_url: Optional[str] = None, coun
     else:
         return f"https://www.{name_slug}.edu/admissions"
 
+def make_resolver() -> aiohttp.abc.AbstractResolver:
+    """Return an aiodns-backed resolver when aiodns is installed, else aiohttp's threaded resolver."""
+    try:
+        return aiohttp.AsyncResolver()
+    except RuntimeError:
+        return aiohttp.ThreadedResolver()
+
+async def resolve_universities(entries: List[Tuple[str, Optional[str], Optional[str]]]) -> AsyncIterator[Dict[str, str]]:
+    """Find URLs for (name, fallback URL, country hint) entries concurrently, yielding results in input order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UNIVERSITIES)
+    load_verify_cache()
+    try:
+        # Cap connections per host so one university's candidate burst doesn't hammer its domain,
+        # and cache DNS answers since most candidates share a handful of hostnames
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=4,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            resolver=make_resolver(),
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        # One session for the whole run: pooled keep-alive connections and shared default headers
+        async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session:
+            async def resolve(university_name: str, fallback_url: Optional[str], country_hint: Optional[str]) -> Optional[Dict[str, str]]:
+                async with semaphore:
+                    logging.info(f"Processing: {university_name}")
+                    url = await find_best_url(session, university_name, fallback_url, country_hint)
+                if url:
+                    return {"name": university_name, "url": url}
+                return None
+        
+            # All universities run concurrently; each result is yielded as soon as
+            # every entry before it has finished
+            tasks = [asyncio.create_task(resolve(*entry)) for entry in entries]
+            try:
+                for task in tasks:
+                    result = await task
+                    if result:
+                        yield result
+            finally:
+                for task in tasks:
+                    task.cancel()
+    finally:
+        # Runs even if resolving fails or is cancelled, so probes already made aren't lost
+        save_verify_cache()
+
+def partial_output_file(output_file: str) -> str:
+    """Path that write_universities streams records to before the run completes."""
+    return output_file + ".partial"
+
+async def write_universities(entries: List[Tuple[str, Optional[str], Optional[str]]], output_file: str) -> int:
+    """Resolve entries and write them to output_file as a JSON array, flushing each record as it is ready.
+    
+    Records go to a ".partial" file next to output_file, which only replaces output_file once every
+    entry has resolved. The array is closed even if resolving fails, so an interrupted run leaves
+    valid JSON with everything saved so far in the partial file and the previous output untouched.
+    """
+    partial_file = partial_output_file(output_file)
+    count = 0
+    with open(partial_file, 'wb') as f:
+        f.write(b'[')
+        try:
+            async for university in resolve_universities(entries):
+                # Indent each record one level so the file matches an indented dump of the whole list
+                record = json_dumps_indented(university).replace(b'\n', b'\n  ')
+                f.write((b',\n  ' if count else b'\n  ') + record)
+                f.flush()
+                count += 1
+        finally:
+            f.write(b'\n]' if count else b']')
+    os.replace(partial_file, output_file)
+    return count
+
 def process_university_list(input_file: str, output_file: str):
     """Process a CSV file of university names and optional fallback URLs to create a JSON file with URLs."""
-    universities = []
+    entries = []
     
     # Create output directory if it doesn't exist
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
@@ -387,17 +830,7 @@ def process_university_list(input_file: str, output_file: str):
                     university_name = row[0].strip()
                     fallback_url = row[1].strip() if len(row) > 1 and row[1].strip() else None
                     country_hint = row[2].strip() if len(row) > 2 and row[2].strip() else None
-                    
-                    logging.info(f"Processing: {university_name}")
-                    
-                    # Find the best URL for this university
-                    url = find_best_url(university_name, fallback_url, country_hint)
-                    
-                    if url:
-                        universities.append({
-                            "name": university_name,
-                            "url": url
-                        })
+                    entries.append((university_name, fallback_url, country_hint))
             else:
                 # Parse as plain text (one university per line)
                 f.seek(0)  # Reset file pointer
@@ -407,29 +840,20 @@ def process_university_list(input_file: str, output_file: str):
                     university_name = line.strip()
                     if not university_name:
                         continue
-                    
-                    logging.info(f"Processing: {university_name}")
-                    
-                    # Find the best URL for this university
-                    url = find_best_url(university_name)
-                    
-                    if url:
-                        universities.append({
-                            "name": university_name,
-                            "url": url
-                        })
+                    entries.append((university_name, None, None))
     except Exception as e:
         logging.error(f"Error reading input file: {e}")
         return False
     
-    # Save to JSON file
+    # Find the best URL for every university, saving each to the JSON file as it resolves
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(universities, f, indent=2)
-        logging.info(f"Successfully saved {len(universities)} universities to {output_file}")
+        count = asyncio.run(write_universities(entries, output_file))
+        logging.info(f"Successfully saved {count} universities to {output_file}")
         return True
     except Exception as e:
         logging.error(f"Error writing output file: {e}")
+        if os.path.exists(partial_output_file(output_file)):
+            logging.error(f"Universities resolved before the failure were saved to {partial_output_file(output_file)}")
         return False
 
 def main():
@@ -0,0 +1,23 @@
+import asyncio
+import logging
+from typing import Dict, List
+from urllib.parse import urlparse
+
+import config
+
+
+async def prewarm_dns(universities: List[Dict[str, str]]) -> None:
+    """Resolve every university hostname up front so first page loads skip the DNS round trip."""
+    loop = asyncio.get_running_loop()
+    hosts = {urlparse(uni["url"]).hostname for uni in universities}
+    hosts.discard(None)
+    if not hosts:
+        return
+    
+    # Lookups run concurrently; failures are left for the crawl itself to report
+    results = await asyncio.gather(
+        *(asyncio.wait_for(loop.getaddrinfo(host, 443), config.DEFAULT_TIMEOUT) for host in hosts),
+        return_exceptions=True
+    )
+    resolved = sum(1 for r in results if not isinstance(r, BaseException))
+    logging.info(f"Pre-resolved {resolved}/{len(hosts)} university hostnames")
@@ -0,0 +1,15 @@
+# Data categories whose "Not found" placeholder is normalized to None on load
+DATA_KEYS = ("courses", "course_descriptions", "admissions_requirements",
+             "application_deadlines", "early_admission", "regular_admission")
+
+
+def normalize_missing(data):
+    """Replace empty or "Not found" categories with None so checks become simple truthiness tests."""
+    for uni in data:
+        for key in DATA_KEYS:
+            if key not in uni:
+                continue
+            value = uni[key]
+            if not value or value[0] == "Not found":
+                uni[key] = None
+    return data
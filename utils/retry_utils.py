@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import random
+from typing import Dict, Optional
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+
+import config
+
+# HTTP status codes worth retrying (rate limiting and temporary server-side failures)
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Substrings of crawl4ai error messages that indicate a timeout or dropped connection
+TRANSIENT_ERROR_MARKERS = (
+    "timeout", "timed out", "connection reset", "err_connection_reset",
+    "err_connection_closed", "err_timed_out", "econnreset",
+)
+
+
+def parse_retry_after(headers: Optional[Dict[str, str]]) -> Optional[float]:
+    """Return the Retry-After delay in seconds from response headers, if present."""
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == "retry-after":
+            try:
+                return max(0.0, float(value))
+            except (TypeError, ValueError):
+                # HTTP-date form is rare for crawled pages; fall back to normal backoff
+                return None
+    return None
+
+
+def is_transient_failure(result) -> bool:
+    """Return True if a failed CrawlResult looks worth retrying (rate limit, 5xx, timeout or reset)."""
+    if getattr(result, "status_code", None) in TRANSIENT_STATUS_CODES:
+        return True
+    if getattr(result, "success", True):
+        return False
+    error_message = (getattr(result, "error_message", None) or "").lower()
+    return any(marker in error_message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+async def arun_with_retry(crawler: AsyncWebCrawler, url: str, run_config: CrawlerRunConfig):
+    """
+    Run crawler.arun, retrying with exponential backoff and jitter only on transient failures.
+    
+    Args:
+        crawler: The active AsyncWebCrawler
+        url: The URL to crawl
+        run_config: The crawler run configuration
+        
+    Returns:
+        The CrawlResult of the last attempt
+    """
+    for attempt in range(config.MAX_RETRIES):
+        last_attempt = attempt == config.MAX_RETRIES - 1
+        retry_after = None
+        try:
+            result = await crawler.arun(url=url, config=run_config)
+        except (asyncio.TimeoutError, OSError) as e:
+            # crawl4ai normally reports failures via result.success; this only covers errors it lets escape
+            if last_attempt:
+                raise
+            logging.warning(f"Transient error crawling {url} (attempt {attempt + 1}/{config.MAX_RETRIES}): {e}")
+        else:
+            # Permanent failures (bad host, TLS errors, 404s) are returned at once instead of retried
+            if last_attempt or not is_transient_failure(result):
+                return result
+            retry_after = parse_retry_after(getattr(result, "response_headers", None))
+            logging.warning(
+                f"Crawl of {url} failed with status {getattr(result, 'status_code', None)}: "
+                f"{getattr(result, 'error_message', None)} (attempt {attempt + 1}/{config.MAX_RETRIES})"
+            )
+        
+        # Exponential backoff with jitter
+        delay = min(config.RETRY_MAX_DELAY, config.RETRY_BACKOFF_BASE * 2 ** attempt)
+        delay += random.uniform(0, config.RETRY_BACKOFF_BASE)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, config.RETRY_MAX_DELAY))
+        await asyncio.sleep(delay)